@@ -4,6 +4,7 @@ import io
 import os
 import plotly.graph_objects as go
 import base64 # Still needed for st.logo
+from stl import mesh, Mode
 from knob_lib import generate_knob_mesh, NUT_TYPES
 
 # --- HELPER FUNCTIONS ---
@@ -22,6 +23,57 @@ def _get_base64_image(image_path):
     with open(image_path, "rb") as img_file:
         return base64.b64encode(img_file.read()).decode()
 
+def _set_knob_style(style):
+    st.session_state.knob_style = style
+
+@st.cache_data(max_entries=32)
+def _cached_mesh_data(**params):
+    """Generates the knob mesh, cached by parameters (returns the raw STL array, not a Mesh)."""
+    return generate_knob_mesh(**params).data
+
+@st.cache_resource(max_entries=8)
+def _build_preview_figure(vector_bytes):
+    """Builds the Plotly preview for a mesh, cached by its raw triangle data."""
+    vecs = np.frombuffer(vector_bytes, dtype=np.float32).reshape(-1, 3, 3)
+    x = vecs[:, :, 0].flatten()
+    y = vecs[:, :, 1].flatten()
+    z = vecs[:, :, 2].flatten()
+    
+    i_idx = np.arange(0, len(x), 3)
+    j_idx = np.arange(1, len(x), 3)
+    k_idx = np.arange(2, len(x), 3)
+    
+    fig = go.Figure(data=[
+        go.Mesh3d(
+            x=x, y=y, z=z,
+            i=i_idx, j=j_idx, k=k_idx,
+            color='#3b82f6', 
+            opacity=1.0,
+            flatshading=False, 
+            lighting=dict(
+                ambient=0.4, 
+                diffuse=0.9, 
+                specular=0.1, 
+                roughness=0.5
+            )
+        )
+    ])
+    
+    fig.update_layout(
+        scene=dict(
+            aspectmode='data',
+            xaxis=dict(visible=False),
+            yaxis=dict(visible=False),
+            zaxis=dict(visible=False),
+            camera=dict(eye=dict(x=1.3, y=1.3, z=1.3)),
+            bgcolor='#f8fafc' 
+        ),
+        margin=dict(l=0, r=0, b=0, t=0),
+        height=500,
+        paper_bgcolor='#f8fafc'
+    )
+    return fig
+
 # --- CONFIGURATION ---
 st.set_page_config(
     page_title="Knob Generator",
@@ -134,14 +186,16 @@ st.markdown(f"""
         margin: 5px; 
     }}
 
-    /* Round Button Styling */
+    /* Round Button Styling (colors set per style below) */
     button[data-testid="stButton-primary-btn_round_style"] {{
-        background-color: {NAVY_COLOR} !important;
+        background-color: var(--btn-round-bg, {NAVY_COLOR}) !important;
+        color: var(--btn-round-fg, white) !important;
     }}
     
-    /* Lobed Button Styling */
+    /* Lobed Button Styling (colors set per style below) */
     button[data-testid="stButton-primary-btn_lobed_style"] {{
-        background-color: {NAVY_COLOR} !important;
+        background-color: var(--btn-lobed-bg, {NAVY_COLOR}) !important;
+        color: var(--btn-lobed-fg, white) !important;
     }}
 
     /* Inspiration link styling */
@@ -164,22 +218,17 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 # --- Dynamic Button Styling with Session State ---
-# Round button
+# Only the button colors change with the selected style, so they are passed
+# as CSS variables and the large stylesheet above stays identical between
+# reruns.
+is_round = st.session_state.knob_style == 'Round'
 st.markdown(f"""
 <style>
-    button[data-testid="stButton-primary-btn_round_style"] {{
-        background-color: {'#1e293b' if st.session_state.knob_style == 'Round' else '#cbd5e1'} !important;
-        color: {'white' if st.session_state.knob_style == 'Round' else '#1e293b'} !important;
-    }}
-</style>
-""", unsafe_allow_html=True)
-
-# Lobed button
-st.markdown(f"""
-<style>
-    button[data-testid="stButton-primary-btn_lobed_style"] {{
-        background-color: {'#1e293b' if st.session_state.knob_style == 'Lobed' else '#cbd5e1'} !important;
-        color: {'white' if st.session_state.knob_style == 'Lobed' else '#1e293b'} !important;
+    :root {{
+        --btn-round-bg: {NAVY_COLOR if is_round else SILVER_GREY_COLOR};
+        --btn-round-fg: {'white' if is_round else NAVY_COLOR};
+        --btn-lobed-bg: {SILVER_GREY_COLOR if is_round else NAVY_COLOR};
+        --btn-lobed-fg: {NAVY_COLOR if is_round else 'white'};
     }}
 </style>
 """, unsafe_allow_html=True)
@@ -194,15 +243,13 @@ with st.sidebar:
     
     st.markdown("**Profile Style**")
     
+    # Callbacks run before the rerun, so the button CSS above already sees
+    # the new style without a second st.rerun()
     col_r, col_l = st.columns(2)
     with col_r:
-        if st.button("Round", key="btn_round_style"):
-            st.session_state.knob_style = "Round"
-            st.rerun()
+        st.button("Round", key="btn_round_style", on_click=_set_knob_style, args=("Round",))
     with col_l:
-        if st.button("Lobed", key="btn_lobed_style"):
-            st.session_state.knob_style = "Lobed"
-            st.rerun()
+        st.button("Lobed", key="btn_lobed_style", on_click=_set_knob_style, args=("Lobed",))
             
     col_dim1, col_dim2 = st.columns(2)
     with col_dim1:
@@ -293,7 +340,7 @@ col_preview, col_dl = st.columns([3, 1])
 
 with col_preview:
     try:
-        mesh_obj = generate_knob_mesh(
+        mesh_obj = mesh.Mesh(_cached_mesh_data(
             knob_diameter=knob_dia,
             knob_height=knob_height,
             knob_style=st.session_state.knob_style, 
@@ -316,46 +363,9 @@ with col_preview:
             nut_info=nut_info,
             nut_location=nut_loc,
             segments=resolution
-        )
-        
-        vecs = mesh_obj.vectors
-        x = vecs[:, :, 0].flatten()
-        y = vecs[:, :, 1].flatten()
-        z = vecs[:, :, 2].flatten()
-        
-        i_idx = np.arange(0, len(x), 3)
-        j_idx = np.arange(1, len(x), 3)
-        k_idx = np.arange(2, len(x), 3)
+        ), calculate_normals=False)
         
-        fig = go.Figure(data=[
-            go.Mesh3d(
-                x=x, y=y, z=z,
-                i=i_idx, j=j_idx, k=k_idx,
-                color='#3b82f6', 
-                opacity=1.0,
-                flatshading=False, 
-                lighting=dict(
-                    ambient=0.4, 
-                    diffuse=0.9, 
-                    specular=0.1, 
-                    roughness=0.5
-                )
-            )
-        ])
-        
-        fig.update_layout(
-            scene=dict(
-                aspectmode='data',
-                xaxis=dict(visible=False),
-                yaxis=dict(visible=False),
-                zaxis=dict(visible=False),
-                camera=dict(eye=dict(x=1.3, y=1.3, z=1.3)),
-                bgcolor='#f8fafc' 
-            ),
-            margin=dict(l=0, r=0, b=0, t=0),
-            height=500,
-            paper_bgcolor='#f8fafc'
-        )
+        fig = _build_preview_figure(mesh_obj.vectors.tobytes())
         
         st.plotly_chart(fig, use_container_width=True)
         
@@ -365,11 +375,12 @@ with col_preview:
 with col_dl:
     st.metric("Volume", f"{mesh_obj.get_mass_properties()[0] / 1000:.1f} cc")
     
+    fname = f"Knob_{st.session_state.knob_style}_{knob_dia}mm.stl"
+    
     out_io = io.BytesIO()
-    mesh_obj.save("temp_knob.stl", fh=out_io)
+    mesh_obj.save(fname, fh=out_io, mode=Mode.BINARY, update_normals=False)
     out_io.seek(0)
     
-    fname = f"Knob_{st.session_state.knob_style}_{knob_dia}mm.stl"
     st.download_button("Download STL", out_io, file_name=fname, mime="application/octet-stream")
     
     st.caption("Use 'Resolution' 128 for final high-quality export.")
@@ -1,5 +1,6 @@
 import numpy as np
 import math
+import functools
 from stl import mesh
 
 # --- CONSTANTS ---
@@ -13,56 +14,114 @@ NUT_TYPES = {
     "M8 Nut": {"width": 13.0, "height": 6.5, "tolerance": 0.3},
 }
 
-def create_circle_profile(diameter, segments=60):
-    radius = diameter / 2.0
-    vertices = []
-    for i in range(segments):
-        angle = 2 * math.pi * i / segments
-        vertices.append((radius * math.cos(angle), radius * math.sin(angle)))
-    return vertices
+# Angle tables shared by every profile of a given resolution
+_ANG_CACHE = {}
 
-def create_lobed_profile(diameter, lobes, protrusion_ratio, segments=60):
+def _angles(segments):
+    t = _ANG_CACHE.get(segments)
+    if t is None:
+        a = np.linspace(0, 2 * np.pi, segments, endpoint=False, dtype=np.float32)
+        t = (a, np.cos(a), np.sin(a))
+        for arr in t:
+            arr.setflags(write=False)
+        _ANG_CACHE[segments] = t
+    return t
+
+def _cached_profile(func):
+    # Profiles are pure functions of their arguments and are rebuilt with the
+    # same values on most reruns, so memoize them. Results are shared, hence
+    # returned read-only; callers that need to modify one must copy it.
+    @functools.lru_cache(maxsize=64)
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        arr = func(*args, **kwargs)
+        arr.setflags(write=False)
+        return arr
+    return wrapper
+
+# Radial (polar) forms of the profiles: one radius per segment angle.
+# Insetting a polar profile is a plain subtraction, so the shell sweeps
+# work on these and only convert to x/y when emitting a ring.
+@_cached_profile
+def _circle_radii(diameter, segments):
+    return np.full(segments, diameter / 2.0, dtype=np.float32)
+
+@_cached_profile
+def _lobed_radii(diameter, lobes, protrusion_ratio, segments):
     r_outer = diameter / 2.0
     depth_factor = 0.6 * protrusion_ratio
     r_inner = r_outer * (1.0 - depth_factor)
     r_mid = (r_outer + r_inner) / 2.0
     amp = (r_outer - r_inner) / 2.0
-    vertices = []
-    for i in range(segments):
-        angle = 2 * math.pi * i / segments
-        r = r_mid + amp * math.cos(lobes * angle)
-        vertices.append((r * math.cos(angle), r * math.sin(angle)))
-    return vertices
+    a, _, _ = _angles(segments)
+    return r_mid + amp * np.cos(lobes * a)
 
-def create_polygon_profile(diameter, sides, segments=60):
-    radius = (diameter / 2.0) / (math.sqrt(3)/2.0) 
+def _polygon_radii(diameter, sides, segments):
     rotation = 0 
     apothem = diameter / 2.0
     period = 2 * math.pi / sides
-    vertices = []
-    for i in range(segments):
-        theta = 2 * math.pi * i / segments
-        angle_in_sector = (theta - rotation) % period
-        angle_from_center = angle_in_sector - (period / 2.0)
-        r = apothem / math.cos(angle_from_center)
-        vertices.append((r * math.cos(theta), r * math.sin(theta)))
-    return vertices
+    theta, _, _ = _angles(segments)
+    angle_in_sector = np.mod(theta - rotation, period)
+    angle_from_center = angle_in_sector - (period / 2.0)
+    return apothem / np.cos(angle_from_center)
+
+def _polar_to_xy(radii):
+    _, c, s = _angles(len(radii))
+    return np.column_stack([radii * c, radii * s])
+
+@_cached_profile
+def create_circle_profile(diameter, segments=60):
+    return _polar_to_xy(_circle_radii(diameter, segments))
 
+def create_lobed_profile(diameter, lobes, protrusion_ratio, segments=60):
+    return _polar_to_xy(_lobed_radii(diameter, lobes, protrusion_ratio, segments))
+
+@_cached_profile
+def create_polygon_profile(diameter, sides, segments=60):
+    return _polar_to_xy(_polygon_radii(diameter, sides, segments))
+
+@_cached_profile
 def create_d_shaft_profile(diameter, flat_to_opposite, segments=60):
     radius = diameter / 2.0
     d_center_to_flat = flat_to_opposite - radius
-    vertices = []
-    for i in range(segments):
-        angle = 2 * math.pi * i / segments
-        rx = radius * math.cos(angle)
-        ry = radius * math.sin(angle)
-        if rx > d_center_to_flat:
-             rx_new = d_center_to_flat
-             ry_new = d_center_to_flat * math.tan(angle)
-             vertices.append((rx_new, ry_new))
-        else:
-            vertices.append((rx, ry))
-    return vertices
+    angles, c, s = _angles(segments)
+    rx = radius * c
+    ry = radius * s
+    # Points past the flat are projected onto it along their ray
+    on_flat = rx > d_center_to_flat
+    rx_new = np.where(on_flat, d_center_to_flat, rx)
+    ry_new = np.where(on_flat, d_center_to_flat * np.tan(angles), ry)
+    return np.column_stack([rx_new, ry_new])
+
+class _GrowableArray:
+    # Append-only (rows, width) buffer that doubles its capacity when full,
+    # so emitted vertices/faces land straight in a typed array
+    def __init__(self, width, dtype, capacity=4096):
+        self._buf = np.empty((capacity, width), dtype=dtype)
+        self._n = 0
+
+    def extend(self, rows):
+        start = self._n
+        end = start + len(rows)
+        if end > len(self._buf):
+            grown = np.empty((max(end, 2 * len(self._buf)), self._buf.shape[1]), dtype=self._buf.dtype)
+            grown[:start] = self._buf[:start]
+            self._buf = grown
+        self._buf[start:end] = rows
+        self._n = end
+        return start
+
+    def array(self):
+        return self._buf[:self._n]
+
+def _mesh_from_arrays(vertices, faces):
+    # Packs an indexed (vertices, faces) pair into an STL mesh, with normals
+    # computed in one pass so numpy-stl doesn't have to redo them
+    tri = vertices[faces]
+    data = np.zeros(len(faces), dtype=mesh.Mesh.dtype)
+    data['vectors'] = tri
+    data['normals'] = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    return mesh.Mesh(data, calculate_normals=False)
 
 
 def generate_knob_mesh(
@@ -103,7 +162,7 @@ def generate_knob_mesh(
     
     # --- 1. PROFILES ---
     if knob_style == "Lobed":
-        body_profile = create_lobed_profile(knob_diameter, lobes, lobe_protrusion, segments)
+        body_radii = _lobed_radii(knob_diameter, lobes, lobe_protrusion, segments)
     else:
         # Round Style
         if ridges > 0:
@@ -112,11 +171,11 @@ def generate_knob_mesh(
             # We treat 'ridges' as 'lobes'.
             # Default grip depth: 0.05 (5%)
             grip_depth = 0.05 
-            body_profile = create_lobed_profile(knob_diameter, ridges, grip_depth, segments)
+            body_radii = _lobed_radii(knob_diameter, ridges, grip_depth, segments)
         else:
-            body_profile = create_circle_profile(knob_diameter, segments)
+            body_radii = _circle_radii(knob_diameter, segments)
         
-    boss_profile = create_circle_profile(boss_diameter, segments)
+    boss_radii = _circle_radii(boss_diameter, segments)
     
     if shaft_type == "D-Shaft":
         flat_val = 4.5 if shaft_dia == 6.0 else (shaft_dia * 0.75)
@@ -128,53 +187,75 @@ def generate_knob_mesh(
 
 
     # --- 2. MESH STATE ---
-    all_vertices = []
-    all_faces = []
-    
-    def add_quad(p1, p2, p3, p4, flip=False):
-        idx = len(all_vertices)
-        all_vertices.extend([p1, p2, p3, p4])
+    # Vertices are emitted one ring at a time and shared by the quads on
+    # either side of it. Faces are emitted as index blocks covering a whole
+    # ring, built from the per-segment index and its wrapped neighbour.
+    vert_buf = _GrowableArray(3, np.float32)
+    face_buf = _GrowableArray(3, np.int32)
+    seg_i = np.arange(segments)
+    seg_next = np.roll(seg_i, -1)
+
+    def add_verts(pts):
+        return vert_buf.extend(np.reshape(pts, (-1, 3)))
+
+    def add_ring(xy, z):
+        xy = np.asarray(xy)
+        return add_verts(np.column_stack([xy[:, 0], xy[:, 1], np.full(len(xy), z, dtype=np.float32)]))
+
+    def add_quads(p1, p2, p3, p4, flip=False):
         if flip:
-            all_faces.append([idx, idx+2, idx+1])
-            all_faces.append([idx, idx+3, idx+2])
+            tris = [(p1, p3, p2), (p1, p4, p3)]
         else:
-            all_faces.append([idx, idx+1, idx+2])
-            all_faces.append([idx, idx+2, idx+3])
+            tris = [(p1, p2, p3), (p1, p3, p4)]
+        block = np.stack([np.stack(tri, axis=1) for tri in tris], axis=1)
+        face_buf.extend(block.reshape(-1, 3))
+
+    def add_strip(a, b, flip=False):
+        # a/b are ring start indices; arrays of them stitch many ring pairs
+        # in a single broadcast
+        a = np.reshape(a, (-1, 1))
+        b = np.reshape(b, (-1, 1))
+        add_quads((a + seg_i).ravel(), (a + seg_next).ravel(),
+                  (b + seg_next).ravel(), (b + seg_i).ravel(), flip)
+
+    def add_fan(center, a):
+        c = add_verts(center)
+        face_buf.extend(np.column_stack([np.full(segments, c), a + seg_i, a + seg_next]))
 
     # --- 3. OUTER SHELL ---
-    outer_rings = []
+    # Each shell ring is the body profile inset toward the axis at a given
+    # height. Rings are collected as (radii, z) blocks and converted into a
+    # single (rings, segments, 3) array once the ring count is known.
+    _, cos_a, sin_a = _angles(segments)
+
+    def inset_rings(insets):
+        insets = np.asarray(insets, dtype=np.float32)[:, None]
+        return np.where(body_radii > 0.001, body_radii - insets, body_radii)
+
+    ring_blocks = []
     z_base = 0.0
     
     # Boss First
     if boss_height > 0.1:
         z_base = boss_height
-        outer_rings.append([(p[0], p[1], 0.0) for p in boss_profile])
-        outer_rings.append([(p[0], p[1], boss_height) for p in boss_profile])
+        ring_blocks.append((np.stack([boss_radii, boss_radii]), np.array([0.0, boss_height])))
         
     # Main Body with Bottom Fillet
     if bottom_fillet_radius > 0 or bottom_fillet_height > 0:
         b_fillet_steps = 6
-        for s in range(b_fillet_steps + 1):
-            t = s / b_fillet_steps
-            z_f = z_base + bottom_fillet_height * t
-            
-            # Concave Cove Logic
-            if bottom_fillet_height > 0:
-                ratio = 1.0 - math.sin(t * math.pi / 2.0)
-                inset = bottom_fillet_radius * ratio
-            else:
-                inset = 0.0
-            
-            new_ring = []
-            for p in body_profile:
-                mag = math.sqrt(p[0]**2 + p[1]**2)
-                scale = (mag - inset) / mag if mag > 0.001 else 1.0
-                new_ring.append((p[0]*scale, p[1]*scale, z_f))
-            outer_rings.append(new_ring)
+        t = np.arange(b_fillet_steps + 1, dtype=np.float32) / b_fillet_steps
+        z_f = z_base + bottom_fillet_height * t
+        
+        # Concave Cove Logic
+        if bottom_fillet_height > 0:
+            insets = bottom_fillet_radius * (1.0 - np.sin(t * np.pi / 2.0))
+        else:
+            insets = np.zeros_like(t)
+        ring_blocks.append((inset_rings(insets), z_f))
             
         current_z = z_base + bottom_fillet_height
     else:
-        outer_rings.append([(p[0], p[1], z_base) for p in body_profile])
+        ring_blocks.append((body_radii[None], np.array([z_base])))
         current_z = z_base
 
     # Main Wall -> Top Fillet
@@ -182,53 +263,50 @@ def generate_knob_mesh(
     z_fillet_start = max(current_z, z_top_abs - top_fillet_height)
     if is_dome: z_fillet_start = current_z 
         
-    outer_rings.append([(p[0], p[1], z_fillet_start) for p in body_profile])
+    ring_blocks.append((body_radii[None], np.array([z_fillet_start])))
     
     # Top Fillet / Dome
     if is_dome:
         dome_steps = 12
         h_dome = z_top_abs - z_fillet_start
-        for s in range(1, dome_steps + 1):
-            t = s / dome_steps
-            z_curr = z_fillet_start + h_dome * t
-            z_local = z_curr - z_fillet_start
-            r_factor = math.sqrt(max(0, 1 - (z_local/h_dome)**2)) if h_dome > 0 else 0
-            new_ring = []
-            for p in body_profile:
-                new_ring.append((p[0]*r_factor, p[1]*r_factor, z_curr))
-            outer_rings.append(new_ring)
+        t = np.arange(1, dome_steps + 1, dtype=np.float32) / dome_steps
+        z_curr = z_fillet_start + h_dome * t
+        if h_dome > 0:
+            r_factor = np.sqrt(np.clip(1 - t**2, 0, None))
+        else:
+            r_factor = np.zeros_like(t)
+        ring_blocks.append((body_radii[None] * r_factor[:, None], z_curr))
             
     elif top_fillet_radius > 0 or top_fillet_height > 0:
         fillet_steps = 8 
-        for s in range(1, fillet_steps + 1):
-            t = s / fillet_steps 
-            dz_fillet_local = top_fillet_height * t 
-            z_curr = z_fillet_start + dz_fillet_local
-            
-            if top_fillet_height > 0:
-                # Standard Convex Roundover for Top
-                inset = top_fillet_radius * (1 - math.sqrt(max(0, 1 - (dz_fillet_local / top_fillet_height)**2)))
-            else:
-                inset = 0.0
-            
-            new_ring = []
-            for p in body_profile:
-                mag = math.sqrt(p[0]**2 + p[1]**2)
-                scale = (mag - inset) / mag if mag > 0.001 else 1.0
-                new_ring.append((p[0]*scale, p[1]*scale, z_curr))
-            outer_rings.append(new_ring)
+        t = np.arange(1, fillet_steps + 1, dtype=np.float32) / fillet_steps
+        z_curr = z_fillet_start + top_fillet_height * t
+        
+        if top_fillet_height > 0:
+            # Standard Convex Roundover for Top
+            insets = top_fillet_radius * (1 - np.sqrt(np.clip(1 - t**2, 0, None)))
+        else:
+            insets = np.zeros_like(t)
+        ring_blocks.append((inset_rings(insets), z_curr))
+
+    num_rings = sum(len(z) for _, z in ring_blocks)
+    outer_rings = np.empty((num_rings, segments, 3), dtype=np.float32)
+    r = 0
+    for radii, z in ring_blocks:
+        outer_rings[r:r + len(z), :, 0] = radii * cos_a
+        outer_rings[r:r + len(z), :, 1] = radii * sin_a
+        outer_rings[r:r + len(z), :, 2] = z[:, None]
+        r += len(z)
             
     # Stitch Outer Shell
-    for r in range(len(outer_rings) - 1):
-        ring_curr = outer_rings[r]
-        ring_next = outer_rings[r+1]
-        for i in range(segments):
-            next_i = (i + 1) % segments
-            add_quad(ring_curr[i], ring_curr[next_i], ring_next[next_i], ring_next[i])
+    shell_start = add_verts(outer_rings)
+    shell_rings = shell_start + np.arange(len(outer_rings)) * segments
+    add_strip(shell_rings[:-1], shell_rings[1:])
 
     # --- 4. TOP CLOSURE / RECESS ---
     top_outer_ring = outer_rings[-1]
-    z_top_mesh = top_outer_ring[0][2]
+    top_outer_idx = shell_start + (len(outer_rings) - 1) * segments
+    z_top_mesh = top_outer_ring[0, 2]
     
     total_z_height = z_base + knob_height
     z_shaft_top_limit = hole_depth
@@ -242,62 +320,38 @@ def generate_knob_mesh(
             z_shaft_top_limit = total_z_height
 
     if is_dome:
-        final_r = math.sqrt(top_outer_ring[0][0]**2 + top_outer_ring[0][1]**2)
+        final_r = math.sqrt(top_outer_ring[0, 0]**2 + top_outer_ring[0, 1]**2)
         if final_r > 0.1: 
-             center = [0.0, 0.0, z_top_mesh]
-             idx_c = len(all_vertices)
-             all_vertices.append(center)
-             for i in range(segments):
-                next_i = (i + 1) % segments
-                idx_o1 = len(all_vertices)
-                idx_o2 = idx_o1 + 1
-                all_vertices.extend([top_outer_ring[i], top_outer_ring[next_i]])
-                all_faces.append([idx_c, idx_o1, idx_o2])
+             add_fan([0.0, 0.0, z_top_mesh], top_outer_idx)
                 
     elif recess_depth > 0:
         z_floor_abs = z_top_mesh - recess_depth
         recess_start_poly = create_circle_profile(recess_diameter, segments)
-        recess_start_ring = [(p[0], p[1], z_top_mesh) for p in recess_start_poly]
-        for i in range(segments):
-            next_i = (i + 1) % segments
-            add_quad(top_outer_ring[i], top_outer_ring[next_i], 
-                     recess_start_ring[next_i], recess_start_ring[i])
+        recess_start_idx = add_ring(recess_start_poly, z_top_mesh)
+        add_strip(top_outer_idx, recess_start_idx)
         dish_steps = 5
-        dish_rings = [recess_start_ring]
         hole_r = shaft_dia / 2.0 if through_hole else 0.0
-        for s in range(1, dish_steps + 1):
-            t = s / dish_steps
-            curr_radius_factor = (1.0 - t) 
-            curr_r = (recess_diameter/2.0) * curr_radius_factor
-            z_curr = z_top_mesh - recess_depth * (1.0 - curr_radius_factor**2)
-            if curr_r < hole_r: curr_r = hole_r
-            poly = []
-            for i in range(segments):
-                angle = 2 * math.pi * i / segments
-                poly.append((curr_r * math.cos(angle), curr_r * math.sin(angle), z_curr))
-            dish_rings.append(poly)
-            if curr_r <= hole_r + 0.001: break 
-        for r in range(len(dish_rings) - 1):
-            curr = dish_rings[r]
-            nxt = dish_rings[r+1]
-            for i in range(segments):
-                next_i = (i + 1) % segments
-                add_quad(curr[i], curr[next_i], nxt[next_i], nxt[i])
-        final_ring = dish_rings[-1]
-        z_final = final_ring[0][2]
+        # All dish rings in one broadcast; the dish stops at the first ring
+        # that reaches the hole
+        t = np.arange(1, dish_steps + 1, dtype=np.float32) / dish_steps
+        curr_radius_factor = 1.0 - t
+        curr_r = np.maximum((recess_diameter/2.0) * curr_radius_factor, hole_r)
+        z_curr = z_top_mesh - recess_depth * (1.0 - curr_radius_factor**2)
+        at_hole = np.flatnonzero(curr_r <= hole_r + 0.001)
+        if len(at_hole):
+            curr_r, z_curr = curr_r[:at_hole[0] + 1], z_curr[:at_hole[0] + 1]
+        dish = np.empty((len(curr_r), segments, 3), dtype=np.float32)
+        dish[:, :, 0] = curr_r[:, None] * cos_a[None, :]
+        dish[:, :, 1] = curr_r[:, None] * sin_a[None, :]
+        dish[:, :, 2] = z_curr[:, None]
+        dish_start = add_verts(dish)
+        dish_rings = np.concatenate([[recess_start_idx], dish_start + np.arange(len(dish)) * segments])
+        add_strip(dish_rings[:-1], dish_rings[1:])
+        final_r, z_final = curr_r[-1], z_curr[-1]
         z_shaft_top_limit = z_final
-        final_r = math.sqrt(final_ring[0][0]**2 + final_ring[0][1]**2)
         is_open = through_hole or (shaft_type == "Nut Trap" and nut_location == "Top")
         if not is_open and final_r > 0.1:
-            center = [0.0, 0.0, z_final]
-            idx_c = len(all_vertices)
-            all_vertices.append(center)
-            for i in range(segments):
-                next_i = (i + 1) % segments
-                idx_r1 = len(all_vertices)
-                idx_r2 = idx_r1 + 1
-                all_vertices.extend([final_ring[i], final_ring[next_i]])
-                all_faces.append([idx_c, idx_r1, idx_r2])
+            add_fan([0.0, 0.0, z_final], dish_rings[-1])
     else:
         is_open = through_hole or (shaft_type == "Nut Trap" and nut_location == "Top")
         if is_open:
@@ -305,21 +359,11 @@ def generate_knob_mesh(
              if shaft_type == "Nut Trap" and nut_location == "Top":
                  w = nut_info["width"] + nut_info.get("tolerance", 0.2)
                  p = create_polygon_profile(w, 6, segments)
-             hole_poly = [(v[0], v[1], z_top_mesh) for v in p]
-             for i in range(segments):
-                next_i = (i + 1) % segments
-                add_quad(top_outer_ring[i], top_outer_ring[next_i], hole_poly[next_i], hole_poly[i])
+             hole_idx = add_ring(p, z_top_mesh)
+             add_strip(top_outer_idx, hole_idx)
              z_shaft_top_limit = z_top_mesh
         else:
-            center = [0.0, 0.0, z_top_mesh]
-            idx_c = len(all_vertices)
-            all_vertices.append(center)
-            for i in range(segments):
-                next_i = (i + 1) % segments
-                idx_o1 = len(all_vertices)
-                idx_o2 = idx_o1 + 1
-                all_vertices.extend([top_outer_ring[i], top_outer_ring[next_i]])
-                all_faces.append([idx_c, idx_o1, idx_o2])
+            add_fan([0.0, 0.0, z_top_mesh], top_outer_idx)
 
     # --- 5. INNER & 6. BOTTOM ---
     if shaft_type == "Nut Trap" and nut_info:
@@ -327,21 +371,12 @@ def generate_knob_mesh(
         h = nut_info["height"] + 0.2
         trap_poly = create_polygon_profile(w, 6, segments)
         if nut_location == "Bottom":
-            for i in range(segments):
-                next_i = (i + 1) % segments
-                p1 = [trap_poly[i][0], trap_poly[i][1], 0.0]
-                p2 = [trap_poly[next_i][0], trap_poly[next_i][1], 0.0]
-                p3 = [trap_poly[next_i][0], trap_poly[next_i][1], h]
-                p4 = [trap_poly[i][0], trap_poly[i][1], h]
-                add_quad(p1, p2, p3, p4, flip=True)
+            trap_bot = add_ring(trap_poly, 0.0)
+            trap_top = add_ring(trap_poly, h)
+            add_strip(trap_bot, trap_top, flip=True)
             shaft_p = create_circle_profile(shaft_dia, segments)
-            for i in range(segments):
-                next_i = (i + 1) % segments
-                t1 = [trap_poly[i][0], trap_poly[i][1], h]
-                t2 = [trap_poly[next_i][0], trap_poly[next_i][1], h]
-                s1 = [shaft_p[i][0], shaft_p[i][1], h]
-                s2 = [shaft_p[next_i][0], shaft_p[next_i][1], h]
-                add_quad(t2, t1, s1, s2) 
+            shaft_h = add_ring(shaft_p, h)
+            add_quads(trap_top + seg_next, trap_top + seg_i, shaft_h + seg_i, shaft_h + seg_next)
 
     z_bot = 0.0
     z_top = hole_depth
@@ -351,44 +386,24 @@ def generate_knob_mesh(
         z_bot = nut_info["height"] + 0.2
         
     if z_top > z_bot:
-        for i in range(segments):
-            next_i = (i + 1) % segments
-            p1 = [shaft_profile[i][0], shaft_profile[i][1], z_bot]
-            p2 = [shaft_profile[next_i][0], shaft_profile[next_i][1], z_bot]
-            p3 = [shaft_profile[next_i][0], shaft_profile[next_i][1], z_top]
-            p4 = [shaft_profile[i][0], shaft_profile[i][1], z_top]
-            add_quad(p1, p2, p3, p4, flip=True)
+        shaft_bot = add_ring(shaft_profile, z_bot)
+        shaft_top = add_ring(shaft_profile, z_top)
+        add_strip(shaft_bot, shaft_top, flip=True)
         if not through_hole and shaft_type != "Nut Trap":
-             center = [0.0, 0.0, z_top]
-             idx_c = len(all_vertices)
-             all_vertices.append(center)
-             for i in range(segments):
-                next_i = (i + 1) % segments
-                idx_p1 = len(all_vertices)
-                idx_p2 = idx_p1 + 1
-                all_vertices.extend([
-                    [shaft_profile[i][0], shaft_profile[i][1], z_top],
-                    [shaft_profile[next_i][0], shaft_profile[next_i][1], z_top]
-                ])
-                all_faces.append([idx_c, idx_p1, idx_p2])
-
-    bottom_outer_ring = outer_rings[0]
-    inner_bottom = []
+             add_fan([0.0, 0.0, z_top], shaft_top)
+
+    bottom_outer_idx = shell_start
     if shaft_type == "Nut Trap" and nut_location == "Bottom":
          w = nut_info["width"] + nut_info.get("tolerance", 0.2)
          p = create_polygon_profile(w, 6, segments)
-         inner_bottom = [(v[0], v[1], 0.0) for v in p]
+         inner_bottom_idx = add_ring(p, 0.0)
     else:
-         inner_bottom = [(v[0], v[1], 0.0) for v in shaft_profile]
+         inner_bottom_idx = add_ring(shaft_profile, 0.0)
          
-    for i in range(segments):
-        next_i = (i + 1) % segments
-        add_quad(bottom_outer_ring[next_i], bottom_outer_ring[i], inner_bottom[i], inner_bottom[next_i])
-
-    data = np.zeros(len(all_faces), dtype=mesh.Mesh.dtype)
-    np_verts = np.array(all_vertices)
-    for i, face in enumerate(all_faces):
-        for j in range(3):
-            data['vectors'][i][j] = np_verts[face[j]]
+    add_quads(bottom_outer_idx + seg_next, bottom_outer_idx + seg_i,
+              inner_bottom_idx + seg_i, inner_bottom_idx + seg_next)
+
+    all_vertices = vert_buf.array()
+    all_faces = face_buf.array()
             
-    return mesh.Mesh(data)
\ No newline at end of file
+    return _mesh_from_arrays(all_vertices, all_faces)
\ No newline at end of file
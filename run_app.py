@@ -1,61 +1,314 @@
-import streamlit.web.cli as stcli
+from streamlit.web import bootstrap
 import os, sys
 import threading
+import _thread
 import time
-import webbrowser
-import subprocess
+import socket
+import tempfile
+import shutil
+import atexit
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# Bundled files live in PyInstaller's unpack dir when frozen, else next to this script
+_BASEDIR = sys._MEIPASS if getattr(sys, "frozen", False) else os.path.dirname(os.path.abspath(__file__))
 
 def resolve_path(path):
-    if getattr(sys, "frozen", False):
-        basedir = sys._MEIPASS
-    else:
-        basedir = os.path.dirname(__file__)
-    return os.path.join(basedir, path)
+    return os.path.join(_BASEDIR, path)
+
+_APP_PATH = resolve_path("app.py")
+
+def wait_for_server(host, port, timeout=5.0):
+    """Polls until something accepts connections on host:port. Returns False on timeout."""
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
+        try:
+            with socket.create_connection((host, port), timeout=0.1):
+                return True
+        except OSError:
+            time.sleep(0.025)
+    return False
+
+# Common paths for Chrome and Edge on Windows, resolved once at import
+_LOCALAPPDATA = os.environ.get("LOCALAPPDATA", os.path.expanduser(r"~\AppData\Local"))
+_BROWSER_PATHS = [
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
+    r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
+    os.path.join(_LOCALAPPDATA, "Google", "Chrome", "Application", "chrome.exe"),
+    os.path.join(_LOCALAPPDATA, "Microsoft", "Edge", "Application", "msedge.exe"),
+]
+
+# Remembers the browser that worked last time so later launches skip the search
+_BROWSER_CACHE = os.path.join(os.environ.get("LOCALAPPDATA", tempfile.gettempdir()), "knob-generator", "browser.path")
+
+def _read_cached_browser():
+    try:
+        with open(_BROWSER_CACHE) as f:
+            path = f.read().strip()
+    except OSError:
+        return None
+    return path if path and os.path.exists(path) else None
+
+def _write_cached_browser(path):
+    try:
+        os.makedirs(os.path.dirname(_BROWSER_CACHE), exist_ok=True)
+        with open(_BROWSER_CACHE, "w") as f:
+            f.write(path)
+    except OSError:
+        pass
+
+# The app window gets its own browser profile, so the process the launcher
+# starts is always that window's own browser and never the user's session
+_BROWSER_PROFILE = os.path.join(os.path.dirname(_BROWSER_CACHE), "browser-profile")
+
+# Browser processes started by the launcher, closed again when it exits
+_SPAWNED = []
+
+def _kill_spawned():
+    for proc in _SPAWNED:
+        if isinstance(proc, int):
+            # Raw process handle from ShellExecuteExW on Windows
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.TerminateProcess(ctypes.c_void_p(proc), 0)
+            kernel32.CloseHandle(ctypes.c_void_p(proc))
+        elif proc.poll() is None:
+            proc.terminate()
+
+@functools.lru_cache(maxsize=None)
+def _shellexecuteinfo_type():
+    """SHELLEXECUTEINFOW for ShellExecuteExW, built on first use so ctypes is only loaded on Windows."""
+    import ctypes
+    from ctypes import wintypes
+    
+    class SHELLEXECUTEINFOW(ctypes.Structure):
+        _fields_ = [
+            ("cbSize", wintypes.DWORD),
+            ("fMask", ctypes.c_ulong),
+            ("hwnd", wintypes.HWND),
+            ("lpVerb", wintypes.LPCWSTR),
+            ("lpFile", wintypes.LPCWSTR),
+            ("lpParameters", wintypes.LPCWSTR),
+            ("lpDirectory", wintypes.LPCWSTR),
+            ("nShow", ctypes.c_int),
+            ("hInstApp", wintypes.HINSTANCE),
+            ("lpIDList", ctypes.c_void_p),
+            ("lpClass", wintypes.LPCWSTR),
+            ("hkeyClass", wintypes.HKEY),
+            ("dwHotKey", wintypes.DWORD),
+            ("hIconOrMonitor", wintypes.HANDLE),
+            ("hProcess", wintypes.HANDLE),
+        ]
+    
+    return SHELLEXECUTEINFOW
+
+def _launch_app_window(path, url):
+    if os.name == "nt":
+        # ShellExecuteExW is the shell's own fast path for starting a detached GUI app
+        import ctypes
+        SHELLEXECUTEINFOW = _shellexecuteinfo_type()
+        
+        # SEE_MASK_NOCLOSEPROCESS (0x40) hands back a process handle for _kill_spawned;
+        # SEE_MASK_NOASYNC (0x100) because the calling thread ends right after this returns
+        info = SHELLEXECUTEINFOW(cbSize=ctypes.sizeof(SHELLEXECUTEINFOW), fMask=0x40 | 0x100, lpVerb="open",
+                                 lpFile=path, lpParameters=f'--user-data-dir="{_BROWSER_PROFILE}" --no-first-run --app={url}',
+                                 nShow=1)
+        if not ctypes.windll.shell32.ShellExecuteExW(ctypes.byref(info)):
+            return False
+        if info.hProcess:
+            _SPAWNED.append(info.hProcess)
+        return True
+    
+    # Elsewhere the browser is fully detached: no stdio pipes and no
+    # handle inheritance scan
+    import subprocess
+    try:
+        _SPAWNED.append(subprocess.Popen(
+            [path, f"--user-data-dir={_BROWSER_PROFILE}", "--no-first-run", f"--app={url}"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=False
+        ))
+        return True
+    except Exception:
+        return False
+
+def _port_is_free(port):
+    """True if nothing is bound to port, found by binding it ourselves."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("", port))
+        except OSError:
+            return False
+    return True
+
+# Written once our own server is up, so a repeat launch only reuses a server
+# this launcher started and not some other Streamlit app on the same port
+_SERVER_MARKER = os.path.join(os.path.dirname(_BROWSER_CACHE), "server.pid")
+
+def _write_server_marker():
+    try:
+        os.makedirs(os.path.dirname(_SERVER_MARKER), exist_ok=True)
+        with open(_SERVER_MARKER, "w") as f:
+            f.write(str(os.getpid()))
+    except OSError:
+        pass
+
+def _remove_server_marker():
+    try:
+        with open(_SERVER_MARKER) as f:
+            if f.read().strip() != str(os.getpid()):
+                return
+        os.remove(_SERVER_MARKER)
+    except OSError:
+        pass
 
-def open_browser_in_app_mode(url):
+def _pid_alive(pid):
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows, so ask for its exit code instead
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        ok = kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        kernel32.CloseHandle(handle)
+        return bool(ok) and code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def _owns_running_server():
+    try:
+        with open(_SERVER_MARKER) as f:
+            pid = int(f.read().strip())
+    except (OSError, ValueError):
+        return False
+    return _pid_alive(pid)
+
+def is_streamlit_running(url):
+    """True if a Knob Generator server started by this launcher already answers at url."""
+    # A free port is the usual cold-start case; a connection attempt to a closed
+    # port is slow on Windows, so only ask over HTTP when something holds it
+    if _port_is_free(urlsplit(url).port or 80):
+        return False
+    # Someone else's Streamlit app on the port is left to fail the bind as before
+    if not _owns_running_server():
+        return False
+    
+    import urllib.request
+    # Bypass any configured proxy, this is always a local address
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+    try:
+        with opener.open(url.replace("localhost", "127.0.0.1") + "/_stcore/health", timeout=0.5) as resp:
+            return resp.read().strip() == b"ok"
+    except OSError:
+        return False
+
+def install_server_ready_hook(event):
+    """Sets event once Streamlit's server has started. Returns False if the hook isn't available."""
+    on_server_start = getattr(bootstrap, "_on_server_start", None)
+    if on_server_start is None:
+        return False
+    
+    def hooked(server):
+        # server.start() has bound the port by the time this is called
+        _write_server_marker()
+        event.set()
+        on_server_start(server)
+    
+    bootstrap._on_server_start = hooked
+    return True
+
+def open_browser_in_app_mode(url, server_ready=None):
     """Attempts to open the URL in 'App Mode' (no address bar) using Chrome/Edge."""
-    time.sleep(2) # Give Streamlit time to start
-    
-    # Common paths for Chrome and Edge on Windows
-    browser_paths = [
-        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-        r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
-        r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
-        os.path.expanduser(r"~\AppData\Local\Google\Chrome\Application\chrome.exe"),
-        os.path.expanduser(r"~\AppData\Local\Microsoft\Edge\Application\msedge.exe"),
-    ]
+    # Wait for Streamlit to start listening (opens anyway if it never does).
+    # Without a server-start event, poll the port instead.
+    if server_ready is not None:
+        server_ready.wait(timeout=10.0)
+    else:
+        parts = urlsplit(url)
+        wait_for_server(parts.hostname, parts.port or 80)
     
     found_browser = False
-    for path in browser_paths:
-        if os.path.exists(path):
-            try:
-                subprocess.Popen([path, f"--app={url}"])
-                found_browser = True
-                break
-            except Exception:
-                continue
+    preset = os.environ.get("KNOBGEN_BROWSER_PATH")
+    if preset:
+        found_browser = _launch_app_window(preset, url)
+    
+    cached = None if found_browser else _read_cached_browser()
+    if cached:
+        found_browser = _launch_app_window(cached, url)
+    
+    if not found_browser:
+        # Check every candidate at once so slow (cold or roaming) disks
+        # overlap, but still launch in preference order
+        with ThreadPoolExecutor(max_workers=len(_BROWSER_PATHS)) as pool:
+            checks = [pool.submit(os.path.exists, path) for path in _BROWSER_PATHS]
+            for path, exists in zip(_BROWSER_PATHS, checks):
+                if exists.result() and _launch_app_window(path, url):
+                    _write_cached_browser(path)
+                    found_browser = True
+                    break
+    
+    if not found_browser:
+        # Installs outside the usual locations may still be on PATH
+        path = shutil.which("chrome") or shutil.which("msedge")
+        if path and _launch_app_window(path, url):
+            _write_cached_browser(path)
+            found_browser = True
                 
     if not found_browser:
         # Fallback to standard browser open
+        import webbrowser
         webbrowser.open(url)
 
 if __name__ == "__main__":
-    app_path = resolve_path("app.py")
+    app_path = _APP_PATH
+    # Streamlit defaults to port 8501
+    url = "http://localhost:8501"
+    
+    # Headless/server use: skip the browser launcher entirely
+    no_browser = (os.environ.get("KNOBGEN_NO_BROWSER", "").strip().lower() in ("1", "true", "yes")
+                  or "--no-browser" in sys.argv)
+    
+    # Launched again while already running: reuse that server, just open a window
+    if is_streamlit_running(url):
+        if not no_browser:
+            open_browser_in_app_mode(url)
+        sys.exit(0)
+    
+    # Streamlit turns SIGTERM into a normal server shutdown, so atexit
+    # also covers the process being killed
+    atexit.register(_remove_server_marker)
+    server_ready = threading.Event()
+    if not install_server_ready_hook(server_ready):
+        server_ready = None
     
     # Start the browser launcher in a separate thread
-    # Streamlit defaults to port 8501
-    threading.Thread(target=open_browser_in_app_mode, args=("http://localhost:8501",), daemon=True).start()
-    
-    # Run Streamlit
-    sys.argv = [
-        "streamlit",
-        "run",
-        app_path,
-        "--global.developmentMode=false",
-        "--server.headless=true",  # Important: Don't let Streamlit open the browser itself
-        "--server.port=8501",
-        "--theme.base=light"
-    ]
-    
-    sys.exit(stcli.main())
\ No newline at end of file
+    if not no_browser:
+        atexit.register(_kill_spawned)
+        # A bare thread: it is on the critical path before the server binds,
+        # and never needs to be joined (it dies with the process, like a daemon)
+        _thread.start_new_thread(open_browser_in_app_mode, (url, server_ready))
+    
+    # Run Streamlit directly, without going through its Click CLI
+    flag_options = {
+        "global.developmentMode": False,
+        "server.headless": True,  # Important: Don't let Streamlit open the browser itself
+        "server.port": 8501,
+        "theme.base": "light",
+    }
+    # As `streamlit run` does, so a .streamlit/ folder next to app.py is picked up
+    from streamlit import config as st_config
+    st_config._main_script_path = os.path.abspath(app_path)
+    bootstrap.load_config_options(flag_options)
+    bootstrap.run(app_path, False, [], flag_options)
\ No newline at end of file